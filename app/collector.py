@@ -8,6 +8,10 @@ This module defines classes and methods to collect house data, including:
 
 Dependencies:
     os
+    sys
+    queue
+    logging
+    concurrent.futures
     dotenv
     funda.FundaService
     location.LocationService
@@ -15,6 +19,11 @@ Dependencies:
     notion_uploader.NotionUploaderService
     house.Address
     house.House
+    house.get_full_address
+
+Functions:
+    setup_logging() -> logging.handlers.QueueListener: Configures logging to write messages 
+    from a background thread.
 
 Classes:
     App: Main application class for collecting and managing house data.
@@ -23,12 +32,19 @@ Methods in App:
     __init__(notion_uploader_service: NotionUploaderService, life_level_service: 
     LifeLevelScoreService, location_service: LocationService, 
     funda_service: FundaService) -> None: Initializes the App class with the given services.
-    create_house(house_id: int, house_dict: dict) -> House: Creates a House object from provided 
-    house details.
+    create_house(house_id: int, house_dict: dict, zip_code: str, s_office_travel_time: str, 
+    v_office_travel_time: str) -> House: Creates a House object from provided house details.
+    search_listings() -> list: Searches for houses on Funda in all configured cities.
+    enrich_listings(listings: list) -> list: Creates House objects from Funda listings.
     run_search_and_upload() -> None: Runs the search for houses and uploads them to Notion.
 """
 
 import os
+import sys
+import queue
+import logging
+import logging.handlers
+from concurrent.futures import ThreadPoolExecutor
 
 from dotenv import load_dotenv
 
@@ -37,15 +53,24 @@ from location import LocationService
 from life_level import LifeLevelScoreService
 from notion_uploader import NotionUploaderService
 
-from house import Address, House
+from house import Address, House, get_full_address
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 CITIES = os.getenv("CITIES").split(",")
 
 OFFICE_S = os.getenv("OFFICE_S")
 OFFICE_V = os.getenv("OFFICE_V")
 
+# Number of cities searched on Funda at the same time. Each search already fetches several
+# Funda pages concurrently.
+FUNDA_SEARCH_MAX_WORKERS = 3
+
+# Number of addresses geocoded with Google Maps at the same time.
+ENRICH_MAX_WORKERS = 10
+
 
 class App:
     """
@@ -83,6 +108,9 @@ class App:
         self,
         house_id: int,
         house_dict: dict,
+        zip_code: str,
+        s_office_travel_time: str,
+        v_office_travel_time: str,
     ) -> House:
         """
         Creates a House object from provided house details.
@@ -94,18 +122,17 @@ class App:
                 - price (int): The price of the house.
                 - address (Address): The short form of the house address.
                 - city (str): The city where the house is located.
+            zip_code (str): The ZIP code of the house.
+            s_office_travel_time (str): Travel time from the house to the S office.
+            v_office_travel_time (str): Travel time from the house to the V office.
 
         Returns:
             House: A House object with the provided details and additional calculated attributes.
         """
-        address_full = f"{house_dict['address']}, {house_dict['city']}, Netherlands"
+        address_full = get_full_address(house_dict["address"], house_dict["city"])
 
-        zip_code = self.location.get_zip_code(address_full)
         life_level_score = self.life_level.get_score(zip_code)
 
-        s_office_travel_time = self.location.get_travel_time(address_full, OFFICE_S)
-        v_office_travel_time = self.location.get_travel_time(address_full, OFFICE_V)
-
         house = House(
             id=house_id,
             url=house_dict["url"],
@@ -123,29 +150,127 @@ class App:
 
         return house
 
+    def search_listings(self) -> list:
+        """
+        Searches for houses on Funda in all configured cities.
+
+        Searches for up to FUNDA_SEARCH_MAX_WORKERS cities run concurrently.
+
+        Returns:
+            list: (house_id, house_dict) tuples for all found listings.
+        """
+        with ThreadPoolExecutor(max_workers=FUNDA_SEARCH_MAX_WORKERS) as executor:
+            funda_listings_by_city = list(executor.map(self.funda.search, CITIES))
+
+        return [
+            (listing_id, listing_dict)
+            for funda_listings in funda_listings_by_city
+            if funda_listings
+            for listing_id, listing_dict in funda_listings.items()
+        ]
+
+    def enrich_listings(self, listings: list) -> list:
+        """
+        Creates House objects from Funda listings, adding location data from Google Maps.
+
+        Google Maps data is requested once per unique address: travel times in batches,
+        concurrently with the ZIP code requests.
+
+        Args:
+            listings (list): (house_id, house_dict) tuples returned by search_listings.
+
+        Returns:
+            list: House objects for all listings.
+        """
+        addresses_full = [
+            get_full_address(listing_dict["address"], listing_dict["city"])
+            for _, listing_dict in listings
+        ]
+        unique_addresses = list(dict.fromkeys(addresses_full))
+
+        with ThreadPoolExecutor(max_workers=ENRICH_MAX_WORKERS) as executor:
+            travel_times_future = executor.submit(
+                self.location.get_travel_times_bulk,
+                unique_addresses,
+                [OFFICE_S, OFFICE_V],
+            )
+            zip_codes = list(executor.map(self.location.get_zip_code, unique_addresses))
+
+        travel_times = travel_times_future.result()
+
+        location_data = {
+            address: (zip_code, s_office_travel_time, v_office_travel_time)
+            for address, zip_code, (s_office_travel_time, v_office_travel_time) in zip(
+                unique_addresses, zip_codes, travel_times
+            )
+        }
+
+        funda_houses = [
+            self.create_house(listing_id, listing_dict, *location_data[address_full])
+            for (listing_id, listing_dict), address_full in zip(listings, addresses_full)
+        ]
+
+        self.location.save_cache()
+        logger.info(
+            "Google Maps cache: %d hits, %d misses.",
+            self.location.cache_hits,
+            self.location.cache_misses,
+        )
+
+        return funda_houses
+
     def run_search_and_upload(self) -> None:
         """
         Runs the search for houses and uploads them to Notion.
+
+        The run is split into three stages: searching Funda, enriching the listings with
+        Google Maps data and uploading the resulting houses to Notion.
         """
-        funda_houses = []
+        listings = self.search_listings()
+        funda_houses = self.enrich_listings(listings)
 
-        for city in CITIES:
-            funda_listings = self.funda.search(city)
+        logger.info("Found %d houses.", len(funda_houses))
+        self.notion_uploader.add_houses(funda_houses)
 
-            if funda_listings:
-                for listing_id, listing_dict in funda_listings.items():
-                    funda_houses.append(self.create_house(listing_id, listing_dict))
 
-        print(f"\nFound {len(funda_houses)} houses.\n")
-        self.notion_uploader.add_houses(funda_houses)
+def setup_logging() -> logging.handlers.QueueListener:
+    """
+    Configures logging to write messages to stdout from a background thread.
 
+    Log records are put on a queue by the threads producing them and written by a
+    QueueListener, so worker threads never wait on console output. Handlers added to the
+    root logger before, e.g. by imported libraries, are replaced.
 
-if __name__ == "__main__":
-    app = App(
-        notion_uploader_service=NotionUploaderService(),
-        life_level_service=LifeLevelScoreService(),
-        location_service=LocationService(),
-        funda_service=FundaService(),
+    Returns:
+        logging.handlers.QueueListener: The started listener, to be stopped before exit.
+    """
+    log_queue = queue.Queue(-1)
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("%(message)s"))
+
+    logging.basicConfig(
+        level=logging.INFO,
+        handlers=[logging.handlers.QueueHandler(log_queue)],
+        force=True,
     )
 
-    app.run_search_and_upload()
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    listener.start()
+    return listener
+
+
+if __name__ == "__main__":
+    log_listener = setup_logging()
+
+    try:
+        app = App(
+            notion_uploader_service=NotionUploaderService(),
+            life_level_service=LifeLevelScoreService(),
+            location_service=LocationService(),
+            funda_service=FundaService(),
+        )
+
+        app.run_search_and_upload()
+    finally:
+        log_listener.stop()
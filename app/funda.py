@@ -14,11 +14,17 @@ Environment Variables:
 Dependencies:
     re
     os
+    concurrent.futures
     funda_scraper (for the FundaScraper class)
 
 Classes:
+    ConcurrentFundaScraper: A FundaScraper which fetches search result pages concurrently.
     FundaService: A service class to search for houses on Funda.
 
+Methods in ConcurrentFundaScraper:
+    fetch_all_links(page_start: int = None, n_pages: int = None) -> None: Collects all available 
+      property links across multiple search result pages.
+
 Methods in FundaService:
     search(search_city: str) -> dict: Searches for houses on Funda in the specified city and 
       returns the results as a dictionary.
@@ -27,6 +33,7 @@ Methods in FundaService:
 import re
 import os
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 from dotenv import load_dotenv
@@ -40,6 +47,79 @@ FUNDA_SEARCH_MAX_PRICE = os.getenv("FUNDA_SEARCH_MAX_PRICE")
 FUNDA_SEARCH_DAYS_SINCE = os.getenv("FUNDA_SEARCH_DAYS_SINCE")
 FUNDA_SEARCH_PROPERTY_TYPE = os.getenv("FUNDA_SEARCH_PROPERTY_TYPE")
 
+HOUSE_ID_ADDRESS_PATTERN = re.compile(r"huis-(\d+)-(.+?)/")
+CITY_PATTERN = re.compile(r"koop/([^/]+)/")
+PRICE_PATTERN = re.compile(r"€\s*([\d.]+)")
+
+# Number of search result pages fetched at the same time for one city.
+FUNDA_PAGE_FETCH_WORKERS = 4
+
+
+class ConcurrentFundaScraper(FundaScraper):
+    """
+    A FundaScraper which fetches search result pages concurrently.
+
+    FundaScraper fetches search result pages one by one until it reaches a page without
+    results. This class fetches them in batches of FUNDA_PAGE_FETCH_WORKERS pages instead,
+    stopping after the batch which contains the last page.
+
+    It relies on FundaScraper internals of the pinned funda-scraper version and falls back
+    to FundaScraper's own page loop if they are missing.
+
+    Methods:
+        fetch_all_links(page_start: int = None, n_pages: int = None) -> None:
+            Collects all available property links across multiple search result pages.
+    """
+
+    def fetch_all_links(self, page_start: int = None, n_pages: int = None) -> None:
+        """
+        Collects all available property links across multiple search result pages.
+
+        Args:
+            page_start (int, optional): The first page to fetch. Defaults to self.page_start.
+            n_pages (int, optional): The number of pages to fetch. Defaults to self.n_pages.
+        """
+        if not (
+            hasattr(self, "_build_main_query_url")
+            and hasattr(self, "_get_links_from_one_parent")
+        ):
+            super().fetch_all_links(page_start, n_pages)
+            return
+
+        page_start = self.page_start if page_start is None else page_start
+        n_pages = self.n_pages if n_pages is None else n_pages
+        main_url = self._build_main_query_url()
+
+        def get_links_from_page(page: int) -> list:
+            try:
+                return self._get_links_from_one_parent(
+                    f"{main_url}&search_result={page}"
+                )
+            except IndexError:
+                return None
+
+        urls = []
+        pages = range(page_start, page_start + n_pages)
+
+        with ThreadPoolExecutor(max_workers=FUNDA_PAGE_FETCH_WORKERS) as executor:
+            for batch_start in range(0, len(pages), FUNDA_PAGE_FETCH_WORKERS):
+                batch = pages[batch_start : batch_start + FUNDA_PAGE_FETCH_WORKERS]
+                last_page_reached = False
+
+                for page, item_list in zip(
+                    batch, executor.map(get_links_from_page, batch)
+                ):
+                    if item_list is None:
+                        self.page_end = page
+                        last_page_reached = True
+                        break
+                    urls += item_list
+
+                if last_page_reached:
+                    break
+
+        self.links = [self.fix_link(url) for url in self.remove_duplicates(urls)]
+
 
 @dataclass
 class FundaService:
@@ -69,7 +149,7 @@ class FundaService:
         Raises:
             ValueError: If house ID, address, or price cannot be extracted from the search results.
         """
-        scraper = FundaScraper(
+        scraper = ConcurrentFundaScraper(
             area=search_city,
             want_to=str(FUNDA_SEARCH_TYPE),
             page_start=1,
@@ -81,54 +161,40 @@ class FundaService:
             property_type=str(FUNDA_SEARCH_PROPERTY_TYPE),
         )
 
-        search_results_dict = {}
         search_results = scraper.run(raw_data=True)
-        search_results_raw_data = search_results.to_dict()
-
-        i = 0
-        if not search_results.empty:
-            while True:
-                url = search_results_raw_data["url"][i]
-                price_str = search_results_raw_data["date_list"][i]
-
-                patterns = {
-                    "id": r"huis-(\d+)-",
-                    "city": r"koop/([^/]+)/",
-                    "price": r"€\s*([\d.]+)",
-                    "address": r"huis-\d+-(.+?)/",
-                }
-
-                matches = {
-                    "id": re.search(patterns["id"], url),
-                    "city": re.search(patterns["city"], url),
-                    "address": re.search(patterns["address"], url),
-                    "price": re.search(patterns["price"], price_str),
-                }
-
-                if matches["id"] and matches["price"] and matches["address"]:
-                    house_id = matches["id"].group(1)
-                    house_dict = {
-                        "url": url,
-                        "city": " ".join(
-                            word.capitalize()
-                            for word in matches["city"].group(1).split("-")
-                        ),
-                        "address": " ".join(
-                            word.capitalize()
-                            for word in matches["address"].group(1).split("-")
-                        ),
-                        "price": int(matches["price"].group(1).replace(".", "")),
-                    }
-
-                    search_results_dict.setdefault(house_id, house_dict)
-
-                else:
-                    raise ValueError(
-                        f"Can't get house ID, address, or price from link {url}."
-                    )
-
-                i += 1
-                if i == len(search_results_raw_data["url"]):
-                    return search_results_dict
-
-        return None
+
+        if search_results.empty:
+            return None
+
+        urls = search_results["url"]
+        ids_addresses = urls.str.extract(HOUSE_ID_ADDRESS_PATTERN)
+        cities = urls.str.extract(CITY_PATTERN)[0]
+        prices = search_results["date_list"].str.extract(PRICE_PATTERN)[0]
+
+        invalid_rows = ids_addresses.isna().any(axis=1) | prices.isna()
+        if invalid_rows.any():
+            raise ValueError(
+                f"Can't get house ID, address, or price from link {urls[invalid_rows].iloc[0]}."
+            )
+
+        search_results_dict = {}
+        for house_id, url, city, address, price in zip(
+            ids_addresses[0].to_numpy(),
+            urls.to_numpy(),
+            cities.to_numpy(),
+            ids_addresses[1].to_numpy(),
+            prices.str.replace(".", "", regex=False).astype(int).to_numpy(),
+        ):
+            search_results_dict.setdefault(
+                house_id,
+                {
+                    "url": url,
+                    "city": " ".join(word.capitalize() for word in city.split("-")),
+                    "address": " ".join(
+                        word.capitalize() for word in address.split("-")
+                    ),
+                    "price": int(price),
+                },
+            )
+
+        return search_results_dict
@@ -3,6 +3,10 @@ Module for representing addresses and house details using data classes.
 
 Dependencies:
     dataclasses
+    functools
+
+Functions:
+    get_full_address(short: str, city: str) -> str: Builds the full form of an address.
 
 Classes:
     Address: Dataclass which represents an address with short and full forms, city, and ZIP code.
@@ -11,6 +15,24 @@ Classes:
 """
 
 from dataclasses import dataclass
+from functools import cached_property, lru_cache
+
+
+@lru_cache(maxsize=None)
+def get_full_address(short: str, city: str) -> str:
+    """
+    Builds the full form of an address, as used for Google Maps requests.
+
+    Results are cached, so every caller gets the same string object for the same address.
+
+    Args:
+        short (str): The short form of the address.
+        city (str): The city where the address is located.
+
+    Returns:
+        str: The full form of the address, including city and country.
+    """
+    return f"{short}, {city}, Netherlands"
 
 
 @dataclass
@@ -44,6 +66,10 @@ class House:
         s_office_travel_time (str): Travel time from the house to the S office.
         v_office_travel_time (str): Travel time from the house to the V office.
         life_level_score (float): The life level score based on the house's postal code.
+
+    Properties:
+        notion_properties (dict): The Notion database properties of the house, built once
+            and cached on the instance.
     """
 
     id: int
@@ -53,3 +79,27 @@ class House:
     s_office_travel_time: str
     v_office_travel_time: str
     life_level_score: float
+
+    @cached_property
+    def notion_properties(self) -> dict:
+        """
+        Builds the Notion database properties of the house.
+
+        Returns:
+            dict: The Notion properties of the house entry.
+        """
+        return {
+            "House ID": {"title": [{"text": {"content": str(self.id)}}]},
+            "URL": {"url": self.url},
+            "Post Address": {"rich_text": [{"text": {"content": self.address.full}}]},
+            "City": {"rich_text": [{"text": {"content": self.address.city}}]},
+            "Price": {"number": self.price},
+            "ZIP Code": {"rich_text": [{"text": {"content": self.address.zip_code}}]},
+            "Time to office S.": {
+                "rich_text": [{"text": {"content": self.s_office_travel_time}}]
+            },
+            "Time to office V.": {
+                "rich_text": [{"text": {"content": self.v_office_travel_time}}]
+            },
+            "Life Level Score": {"number": self.life_level_score},
+        }
@@ -6,25 +6,36 @@ to get the score for a given ZIP code. It focuses on using the latest year's dat
 
 Dependencies:
     os
-    pandas
+    csv
+    zipfile
+    numpy
     dataclasses
 
 Classes:
     LifeLevelScoreService: A service class to handle life level scores based on ZIP codes.
 
 Attributes in LifeLevelScoreService:
-    life_level_scores (dict): A dictionary with 'PC4' as keys and 'afw' as float values.
+    life_level_scores (np.ndarray): An array with 'afw' float values indexed by 'PC4'.
 
 Methods in LifeLevelScoreService:
     get_score(zip_code: str) -> float: Retrieves the life level score for a given ZIP code.
-    create_scores_dict_from_csv() -> dict: Reads 'scores.csv' and constructs a dictionary from 
-      its contents, focusing on the latest year's data.
+    create_scores_array_from_csv() -> np.ndarray: Reads 'scores.csv' and constructs an array
+      indexed by 'PC4' from its contents, focusing on the latest year's data. The result is
+      cached in 'scores.npz'.
 """
 
 import os
+import csv
+import zipfile
 from dataclasses import dataclass, field
 
-import pandas as pd
+import numpy as np
+
+# PC4 codes are four-digit numbers, so they can be used directly as array indices.
+PC4_RANGE = 10000
+
+# Cell values read as missing scores, as pandas did when reading 'scores.csv'.
+SCORE_NA_VALUES = frozenset(["", "NA", "N/A", "NULL", "NaN", "nan"])
 
 
 @dataclass
@@ -36,16 +47,17 @@ class LifeLevelScoreService:
     to get the score for a given ZIP code. It focuses on using the latest year's data.
 
     Attributes:
-        life_level_scores (dict): A dictionary with 'PC4' as keys and 'afw' as float values.
+        life_level_scores (np.ndarray): An array with 'afw' float values indexed by 'PC4'.
+            PC4 codes without a score hold NaN.
     """
 
-    life_level_scores: dict = field(init=False)
+    life_level_scores: np.ndarray = field(init=False)
 
     def __post_init__(self):
         """
-        Initializes the life level scores dictionary after the instance is created.
+        Initializes the life level scores array after the instance is created.
         """
-        self.life_level_scores = self.create_scores_dict_from_csv()
+        self.life_level_scores = self.create_scores_array_from_csv()
 
     def get_score(self, zip_code: str) -> float:
         """
@@ -58,34 +70,84 @@ class LifeLevelScoreService:
             float: The life level score associated with the given ZIP code.
 
         Raises:
-            KeyError: If the ZIP code is not found in the life level scores dictionary.
+            KeyError: If the ZIP code has no life level score.
         """
         if zip_code != "ZIP CODE NOT FOUND":
-            return self.life_level_scores[int(zip_code[:4])]
+            score = float(self.life_level_scores[int(zip_code[:4])])
+            if np.isnan(score):
+                raise KeyError(zip_code)
+            return score
         return 0
 
     @staticmethod
-    def create_scores_dict_from_csv() -> dict:
+    def create_scores_array_from_csv() -> np.ndarray:
         """
         Reads 'scores.csv' located in the data directory near the app folder
-        and constructs a dictionary from its contents, focusing on the latest year's data.
+        and constructs an array indexed by 'PC4' from its contents, focusing on the latest
+        year's data.
+
+        The CSV file is read in a single pass, converting only the 'jaar', 'PC4' and 'afw'
+        columns and keeping only the rows of the latest year seen so far. Missing 'afw'
+        values are stored as NaN.
+
+        The array is cached in 'scores.npz' next to the CSV file, together with the
+        modification time and size of 'scores.csv' it was built from. The cache is reused
+        until either of them changes, even if the new file is older than the cache. An
+        unreadable cache is ignored and rebuilt.
 
         Returns:
-            dict: A dictionary with 'PC4' as keys and 'afw' as float values for the latest year.
+            np.ndarray: An array with 'afw' float values for the latest year indexed by 'PC4'.
         """
         script_dir = os.path.dirname(os.path.abspath(__file__))
 
         app_dir = os.path.dirname(script_dir)
         data_dir = os.path.join(app_dir, "data")
         file_path = os.path.join(data_dir, "scores.csv")
+        cache_path = os.path.join(data_dir, "scores.npz")
+
+        csv_stat = os.stat(file_path)
+        csv_stamp = np.array([csv_stat.st_mtime_ns, csv_stat.st_size], dtype=np.int64)
+
+        if os.path.exists(cache_path):
+            try:
+                with np.load(cache_path) as cache:
+                    if np.array_equal(cache["csv_stamp"], csv_stamp):
+                        return cache["scores"]
+            except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+                pass
+
+        latest_year = None
+        pc4_codes = []
+        scores = []
+
+        with open(file_path, newline="", encoding="utf-8-sig") as scores_file:
+            reader = csv.reader(scores_file)
+            header = next(reader)
+            year_index = header.index("jaar")
+            pc4_index = header.index("PC4")
+            score_index = header.index("afw")
+
+            for row in reader:
+                year = int(row[year_index])
+
+                if latest_year is None or year > latest_year:
+                    latest_year = year
+                    pc4_codes = []
+                    scores = []
+
+                if year == latest_year:
+                    score = row[score_index]
+                    pc4_codes.append(int(row[pc4_index]))
+                    scores.append(np.nan if score in SCORE_NA_VALUES else float(score))
+
+        result_array = np.full(PC4_RANGE, np.nan, dtype=np.float64)
+        result_array[pc4_codes] = scores
 
-        df = pd.read_csv(file_path)
+        tmp_path = f"{cache_path}.tmp"
 
-        latest_year = df["jaar"].max()
-        latest_year_data = df[df["jaar"] == latest_year]
+        with open(tmp_path, "wb") as cache_file:
+            np.savez(cache_file, scores=result_array, csv_stamp=csv_stamp)
 
-        result_dict = {
-            int(row["PC4"]): float(row["afw"]) for _, row in latest_year_data.iterrows()
-        }
+        os.replace(tmp_path, cache_path)
 
-        return result_dict
+        return result_array
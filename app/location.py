@@ -5,12 +5,22 @@ to retrieve ZIP codes from addresses.
 
 Dependencies:
     os
+    json
+    time
+    random
+    logging
+    threading
     datetime
-    googlemaps
+    requests
+    urllib3 (for the Retry policy)
+    rate_limiter (for the RateLimiter class)
 
 Environment Variables:
     GOOGLE_API_KEY: Your Google Maps API key.
 
+Results of Google Maps requests are cached in memory and persisted to 'maps_cache.json' in the 
+data directory, so repeated addresses are not requested again within a run or across runs.
+
 Classes:
     LocationService: A service class to handle interactions with the Google Maps API.
 
@@ -19,25 +29,73 @@ Methods in LocationService:
       day.
     get_travel_time(origin: str, destination: str, mode="transit") -> str: Calculates travel time
       from origin to destination.
+    get_travel_times_bulk(origins: list, destinations: list, mode="transit") -> list: Calculates 
+      travel times from every origin to every destination in batched requests.
     get_zip_code(address: str) -> str: Gets the ZIP code for a given address.
+    get_travel_time_cache_key(origin: str, destination: str, mode: str) -> str: Builds the cache 
+      key for a travel time.
+    get_cached(section: str, key: str) -> str: Looks up a cached Google Maps result.
+    request_maps_api(url: str, params: dict) -> dict: Sends a request to a Google Maps REST 
+      endpoint.
+    load_cache() -> dict: Loads cached Google Maps results from 'maps_cache.json'.
+    save_cache() -> None: Writes cached Google Maps results to 'maps_cache.json'.
 """
 
 import os
+import json
+import time
+import random
+import logging
+import threading
 from datetime import datetime, timedelta
 
-import googlemaps
+import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rate_limiter import RateLimiter
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+DISTANCE_MATRIX_URL = "https://maps.googleapis.com/maps/api/distancematrix/json"
+
+# Distance Matrix API limits per request.
+DISTANCE_MATRIX_MAX_ORIGINS = 25
+DISTANCE_MATRIX_MAX_DESTINATIONS = 25
+DISTANCE_MATRIX_MAX_ELEMENTS = 100
+
+# Request rate and retries of throttled requests, as done by the googlemaps client by default.
+GOOGLE_MAPS_REQUESTS_PER_SECOND = 60.0
+GOOGLE_MAPS_RETRY_STATUSES = ("OVER_QUERY_LIMIT", "UNKNOWN_ERROR")
+GOOGLE_MAPS_MAX_RETRIES = 6
+GOOGLE_MAPS_RETRY_BACKOFF = 0.5
+
+MAPS_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "maps_cache.json"
+)
+
 
 class LocationService:
     """
     A class to interact with the Google Maps API for various geographical and travel-related
     functionalities.
 
+    Attributes:
+        session (requests.Session): Session reusing connections to the Google Maps API.
+        limiter (RateLimiter): Rate limiter shared by all requests to the Google Maps API.
+        departure_time (datetime): Departure time used for travel time requests.
+        departure_hour (int): Departure time in whole hours since the epoch, used in cache keys.
+        cache (dict): Cached ZIP codes by address and travel times by origin, destination
+            mode and departure hour.
+        cache_hits (int): Number of lookups answered from the cache.
+        cache_misses (int): Number of lookups sent to the Google Maps API.
+
     Methods:
         get_departure_time() -> datetime:
             Creates a datetime object for departure at 8 AM the next day.
@@ -45,21 +103,60 @@ class LocationService:
         get_travel_time(origin: str, destination: str, mode="transit") -> str:
             Calculates travel time from origin to destination using the Google Maps API.
 
+        get_travel_times_bulk(origins: list, destinations: list, mode="transit") -> list:
+            Calculates travel times from every origin to every destination using batched
+            Google Maps API requests.
+
         get_zip_code(address: str) -> str:
             Gets the ZIP code for a given address using the Google Maps API.
+
+        get_travel_time_cache_key(origin: str, destination: str, mode: str) -> str:
+            Builds the cache key for a travel time between two locations.
+
+        get_cached(section: str, key: str) -> str:
+            Looks up a cached Google Maps result and counts the cache hit or miss.
+
+        request_maps_api(url: str, params: dict) -> dict:
+            Sends a request to a Google Maps REST endpoint and returns the decoded response.
+
+        load_cache() -> dict:
+            Loads cached Google Maps results from 'maps_cache.json'.
+
+        save_cache() -> None:
+            Writes cached Google Maps results to 'maps_cache.json'.
     """
 
     def __init__(self):
         """
-        Initializes the LocationService with a Google Maps API key.
+        Initializes the LocationService with a Google Maps API key and a session which keeps
+        connections to the Google Maps API alive between requests.
         """
         if GOOGLE_API_KEY == "PUT_YOUR_GOOGLE_API_KEY_HERE":
             raise ValueError(
                 "Google API key in .env file should be set. Now it contains an example value."
             )
 
-        self.gmaps = googlemaps.Client(key=GOOGLE_API_KEY)
+        self.session = requests.Session()
+        self.session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=32,
+                max_retries=Retry(
+                    total=3,
+                    backoff_factor=0.3,
+                    status_forcelist=(500, 502, 503, 504),
+                ),
+            ),
+        )
+        self.limiter = RateLimiter(rate=GOOGLE_MAPS_REQUESTS_PER_SECOND, burst=10)
         self.departure_time = self.get_departure_time()
+        self.departure_hour = int(self.departure_time.timestamp() // 3600)
+
+        self.cache = self.load_cache()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.cache_lock = threading.Lock()
 
     @staticmethod
     def get_departure_time() -> datetime:
@@ -84,15 +181,108 @@ class LocationService:
         Returns:
             str: Duration of travel time if found, otherwise "TRAVEL TIME NOT FOUND".
         """
-        distance_matrix = self.gmaps.distance_matrix(
-            origin, destination, mode=mode, departure_time=self.departure_time
+        cache_key = self.get_travel_time_cache_key(origin, destination, mode)
+        travel_time = self.get_cached("travel_times", cache_key)
+        if travel_time is not None:
+            return travel_time
+
+        distance_matrix = self.request_maps_api(
+            DISTANCE_MATRIX_URL,
+            {
+                "origins": origin,
+                "destinations": destination,
+                "mode": mode,
+                "departure_time": self.departure_hour * 3600,
+            },
         )
 
         if distance_matrix["status"] == "OK":
             if "duration" in distance_matrix["rows"][0]["elements"][0]:
-                return distance_matrix["rows"][0]["elements"][0]["duration"]["text"]
+                travel_time = distance_matrix["rows"][0]["elements"][0]["duration"]["text"]
+                self.cache["travel_times"][cache_key] = travel_time
+                return travel_time
         return "TRAVEL TIME NOT FOUND"
 
+    def get_travel_times_bulk(
+        self, origins: list, destinations: list, mode="transit"
+    ) -> list:
+        """
+        Calculates travel times from every origin to every destination using the Google Maps API.
+
+        Origins and destinations are packed into as few Distance Matrix requests as the API
+        limits allow, instead of one request per origin-destination pair.
+
+        Args:
+            origins (list): The starting points for travel.
+            destinations (list): The endpoints for travel.
+            mode (str, optional): The mode of travel. Defaults to "transit".
+
+        Returns:
+            list: A matrix where element [i][j] is the duration of travel from origins[i] to
+                destinations[j] if found, otherwise "TRAVEL TIME NOT FOUND".
+        """
+        missing_origins = list(
+            dict.fromkeys(
+                origin
+                for origin in origins
+                for destination in destinations
+                if self.get_cached(
+                    "travel_times",
+                    self.get_travel_time_cache_key(origin, destination, mode),
+                )
+                is None
+            )
+        )
+
+        destinations_step = DISTANCE_MATRIX_MAX_DESTINATIONS
+        for destinations_start in range(0, len(destinations), destinations_step):
+            destinations_chunk = destinations[
+                destinations_start : destinations_start + destinations_step
+            ]
+            origins_step = min(
+                DISTANCE_MATRIX_MAX_ORIGINS,
+                DISTANCE_MATRIX_MAX_ELEMENTS // len(destinations_chunk),
+            )
+
+            for origins_start in range(0, len(missing_origins), origins_step):
+                origins_chunk = missing_origins[
+                    origins_start : origins_start + origins_step
+                ]
+
+                distance_matrix = self.request_maps_api(
+                    DISTANCE_MATRIX_URL,
+                    {
+                        "origins": "|".join(origins_chunk),
+                        "destinations": "|".join(destinations_chunk),
+                        "mode": mode,
+                        "departure_time": self.departure_hour * 3600,
+                    },
+                )
+
+                if distance_matrix["status"] != "OK":
+                    continue
+
+                for origin, row in zip(origins_chunk, distance_matrix["rows"]):
+                    for destination, element in zip(destinations_chunk, row["elements"]):
+                        if "duration" in element:
+                            cache_key = self.get_travel_time_cache_key(
+                                origin, destination, mode
+                            )
+                            self.cache["travel_times"][cache_key] = element["duration"][
+                                "text"
+                            ]
+
+        return [
+            [
+                self.cache["travel_times"].get(
+                    self.get_travel_time_cache_key(origin, destination, mode),
+                    "TRAVEL TIME NOT FOUND",
+                )
+                for destination in destinations
+            ]
+            for origin in origins
+        ]
+
     def get_zip_code(self, address: str) -> str:
         """
         Gets the ZIP code for a given address using the Google Maps API.
@@ -103,9 +293,140 @@ class LocationService:
         Returns:
             str: The ZIP code as a string if found, otherwise "ZIP CODE NOT FOUND".
         """
-        geocode_result = self.gmaps.geocode(address)
-        if geocode_result:
-            for component in geocode_result[0]["address_components"]:
+        zip_code = self.get_cached("zip_codes", address)
+        if zip_code is not None:
+            return zip_code
+
+        geocode_result = self.request_maps_api(GEOCODE_URL, {"address": address})
+        if geocode_result["results"]:
+            for component in geocode_result["results"][0]["address_components"]:
                 if "postal_code" in component["types"]:
+                    self.cache["zip_codes"][address] = component["long_name"]
                     return component["long_name"]
         return "ZIP CODE NOT FOUND"
+
+    def get_travel_time_cache_key(self, origin: str, destination: str, mode: str) -> str:
+        """
+        Builds the cache key for a travel time between two locations.
+
+        The key contains the departure hour rather than the exact departure time, so results
+        stay reusable for every request departing within the same hour.
+
+        Args:
+            origin (str): The starting point for travel.
+            destination (str): The endpoint for travel.
+            mode (str): The mode of travel.
+
+        Returns:
+            str: The cache key for the travel time.
+        """
+        return f"{origin}|{destination}|{mode}|{self.departure_hour}"
+
+    def get_cached(self, section: str, key: str):
+        """
+        Looks up a cached Google Maps result and counts the cache hit or miss.
+
+        Args:
+            section (str): The cache section, either "zip_codes" or "travel_times".
+            key (str): The cache key within the section.
+
+        Returns:
+            str: The cached value if found, otherwise None.
+        """
+        value = self.cache[section].get(key)
+        with self.cache_lock:
+            if value is None:
+                self.cache_misses += 1
+            else:
+                self.cache_hits += 1
+        return value
+
+    def request_maps_api(self, url: str, params: dict) -> dict:
+        """
+        Sends a request to a Google Maps REST endpoint and returns the decoded response.
+
+        Requests are rate-limited. Requests throttled by Google Maps (OVER_QUERY_LIMIT) or
+        failed with UNKNOWN_ERROR are retried with exponential backoff.
+
+        Args:
+            url (str): The URL of the Google Maps endpoint.
+            params (dict): Query parameters of the request, without the API key.
+
+        Returns:
+            dict: The decoded JSON response.
+
+        Raises:
+            ValueError: If the Google Maps API rejects the request, or still throttles it
+                after all retries.
+        """
+        for attempt in range(GOOGLE_MAPS_MAX_RETRIES + 1):
+            self.limiter.acquire()
+            response = self.session.get(
+                url, params={**params, "key": GOOGLE_API_KEY}, timeout=60
+            )
+            response.raise_for_status()
+
+            response_data = response.json()
+            if (
+                response_data["status"] not in GOOGLE_MAPS_RETRY_STATUSES
+                or attempt == GOOGLE_MAPS_MAX_RETRIES
+            ):
+                break
+
+            time.sleep(GOOGLE_MAPS_RETRY_BACKOFF * 2**attempt * (random.random() + 0.5))
+
+        if response_data["status"] not in ("OK", "ZERO_RESULTS"):
+            raise ValueError(
+                f"Google Maps API request failed with status {response_data['status']}: "
+                f"{response_data.get('error_message', '')}"
+            )
+
+        return response_data
+
+    def load_cache(self) -> dict:
+        """
+        Loads cached Google Maps results from 'maps_cache.json' in the data directory.
+
+        ZIP codes are kept between runs. Travel times are only kept if they were requested
+        for the same departure hour. An unreadable file is ignored, so all results are
+        requested again.
+
+        Returns:
+            dict: A dictionary with "zip_codes" and "travel_times" sections.
+        """
+        cache = {"zip_codes": {}, "travel_times": {}}
+
+        if os.path.exists(MAPS_CACHE_PATH):
+            try:
+                with open(MAPS_CACHE_PATH, encoding="utf-8") as cache_file:
+                    saved_cache = json.load(cache_file)
+            except (OSError, ValueError) as e:
+                logger.warning("Ignoring unreadable %s: %s", MAPS_CACHE_PATH, e)
+                return cache
+
+            cache["zip_codes"] = saved_cache.get("zip_codes", {})
+            cache["travel_times"] = {
+                key: travel_time
+                for key, travel_time in saved_cache.get("travel_times", {}).items()
+                if key.endswith(f"|{self.departure_hour}")
+            }
+
+        return cache
+
+    def save_cache(self) -> None:
+        """
+        Writes cached Google Maps results to 'maps_cache.json' in the data directory.
+        """
+        tmp_path = f"{MAPS_CACHE_PATH}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {
+                    "zip_codes": self.cache["zip_codes"],
+                    "travel_times": self.cache["travel_times"],
+                },
+                cache_file,
+                ensure_ascii=False,
+            )
+
+        os.replace(tmp_path, MAPS_CACHE_PATH)
@@ -2,12 +2,21 @@
 This module provides a service class to upload house information to a Notion database.
 
 The NotionUploaderService class uses the Notion API to add house listings found on Funda to a 
-specified Notion database.
+specified Notion database. IDs of houses known to be in the database are persisted to 
+'notion_ids.json' in the data directory, so later runs don't query Notion for them again.
 
 Dependencies:
     os
+    json
+    logging
+    atexit
+    threading
+    concurrent.futures
+    orjson
     requests
+    urllib3 (for the Retry policy)
     house (for the House class)
+    rate_limiter (for the RateLimiter class)
 
 Environment Variables:
     NOTION_SECRET: The secret key for Notion API access.
@@ -17,21 +26,67 @@ Classes:
     NotionUploaderService: A service class to handle uploading house data to Notion.
 
 Methods in NotionUploaderService:
+    create_adapter(status_forcelist: tuple) -> HTTPAdapter: Creates a pooled adapter retrying POST 
+      requests to the Notion API.
+    post(url: str, payload: dict) -> requests.Response: Sends a rate-limited POST request to the 
+      Notion API.
+    check_house(house: House) -> bool: Checks if a house is already present in the Notion database.
+    get_existing_ids() -> set: Collects the IDs of all houses already present in the Notion 
+      database.
+    query_ids(query_payload: dict) -> set: Collects the house IDs of all Notion database entries 
+      matching a query.
+    check_houses(houses: list) -> set: Checks which of the given houses are already present in 
+      the Notion database.
+    get_house_id(result: dict) -> str: Extracts the house ID from a Notion database entry.
+    create_page(house: House) -> bool: Creates a Notion database entry for a house.
     add_houses(found_houses: list) -> None: Adds a list of found houses to the Notion 
       database.
+    load_existing_ids() -> set: Loads known house IDs from 'notion_ids.json'.
+    save_existing_ids() -> None: Writes known house IDs to 'notion_ids.json'.
 """
 
 import os
+import json
+import logging
+import atexit
+import threading
+import orjson
 import requests
 
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from house import House
+from rate_limiter import RateLimiter
 from dotenv import load_dotenv
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 NOTION_SECRET = os.getenv("NOTION_SECRET")
 NOTION_DATABASE_ID = os.getenv("NOTION_DATABASE_ID")
 
+# Number of Notion database entries created at the same time. Notion allows an average of
+# three requests per second per integration.
+NOTION_MAX_WORKERS = 3
+NOTION_REQUESTS_PER_SECOND = 3.0
+
+# Number of house IDs checked per filtered query, and the number of unknown houses above
+# which fetching all IDs from the database is cheaper than filtered queries.
+NOTION_FILTER_CHUNK_SIZE = 25
+NOTION_FILTER_SCAN_THRESHOLD = 100
+
+NOTION_QUERY_URL = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
+NOTION_PAGES_URL = "https://api.notion.com/v1/pages"
+NOTION_PAGE_PARENT = {"database_id": NOTION_DATABASE_ID}
+
+NOTION_IDS_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "notion_ids.json"
+)
+
 
 class NotionUploaderService:
     """
@@ -42,22 +97,66 @@ class NotionUploaderService:
 
     Attributes:
         headers (dict): Headers required for the Notion API requests.
+        session (requests.Session): Session reusing connections to the Notion API.
+        limiter (RateLimiter): Rate limiter shared by all requests to the Notion API.
+        existing_ids (set): IDs of houses known to be present in the Notion database, loaded
+            from 'notion_ids.json' and updated with every found or created entry.
+        existing_ids_fetched (bool): Whether all IDs were already fetched from Notion.
+        inflight_checks (dict): Futures of running check_house queries by house ID.
+        inflight_lock (threading.Lock): Lock guarding inflight_checks.
 
     Methods:
+        create_adapter(status_forcelist: tuple) -> HTTPAdapter:
+            Creates a pooled adapter retrying POST requests to the Notion API.
+        post(url: str, payload: dict) -> requests.Response:
+            Sends a rate-limited POST request to the Notion API.
         check_house(house: House) -> bool:
             Checks if a house is already present in the Notion database.
+        get_existing_ids() -> set:
+            Collects the IDs of all houses already present in the Notion database.
+        query_ids(query_payload: dict) -> set:
+            Collects the house IDs of all Notion database entries matching a query.
+        check_houses(houses: list) -> set:
+            Checks which of the given houses are already present in the Notion database.
+        get_house_id(result: dict) -> str:
+            Extracts the house ID from a Notion database entry.
+        create_page(house: House) -> bool:
+            Creates a Notion database entry for a house.
         add_houses(found_houses: list) -> None:
             Adds a list of found houses to the Notion database.
+        load_existing_ids() -> set:
+            Loads known house IDs from 'notion_ids.json'.
+        save_existing_ids() -> None:
+            Writes known house IDs to 'notion_ids.json'.
     """
 
     def __init__(self) -> None:
         """
-        Initializes the NotionUploaderService with the necessary headers for API requests.
+        Initializes the NotionUploaderService with the necessary headers for API requests
+        and a session which keeps connections to the Notion API alive between requests.
+
+        The Notion secret and database ID are validated once here, before any request is sent.
+
+        The session retries rate-limited and failed requests with exponential backoff,
+        waiting as long as Notion's Retry-After header asks. When retries run out, the last
+        response is returned, so callers still see the HTTP error.
+
+        Requests are never retried after a read error, since Notion may already have
+        processed them. Page creation is only retried on 429 and 503, which Notion
+        documents as not processed, so a retry never creates a duplicate entry.
         """
+        if not NOTION_SECRET:
+            raise ValueError("Notion Secret in .env file should be set.")
         if NOTION_SECRET == "PUT_YOUR_NOTION_SECRET_HERE":
             raise ValueError(
                 "Notion Secret in .env file should be set. Now it contains an example value."
             )
+        if not NOTION_DATABASE_ID:
+            raise ValueError("Notion Database ID in .env file should be set.")
+        if NOTION_DATABASE_ID == "PUT_YOUR_NOTION_DATABASE_ID_HERE":
+            raise ValueError(
+                "Notion Database ID in .env file should be set. Now it contains an example value."
+            )
 
         self.headers = {
             "Authorization": f"Bearer {NOTION_SECRET}",
@@ -65,78 +164,329 @@ class NotionUploaderService:
             "Notion-Version": "2022-06-28",
         }
 
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount(
+            "https://",
+            self.create_adapter(status_forcelist=(429, 500, 502, 503, 504)),
+        )
+        self.session.mount(
+            NOTION_PAGES_URL, self.create_adapter(status_forcelist=(429, 503))
+        )
+
+        self.limiter = RateLimiter(rate=NOTION_REQUESTS_PER_SECOND, burst=3)
+        self.existing_ids = self.load_existing_ids()
+        self.existing_ids_fetched = False
+        self.inflight_checks = {}
+        self.inflight_lock = threading.Lock()
+        atexit.register(self.save_existing_ids)
+
+    @staticmethod
+    def create_adapter(status_forcelist: tuple) -> HTTPAdapter:
+        """
+        Creates a pooled adapter retrying POST requests to the Notion API.
+
+        Args:
+            status_forcelist (tuple): HTTP status codes on which requests are retried.
+
+        Returns:
+            HTTPAdapter: The adapter to mount on the session.
+        """
+        return HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=16,
+            max_retries=Retry(
+                total=6,
+                read=0,
+                backoff_factor=0.5,
+                status_forcelist=status_forcelist,
+                allowed_methods=frozenset(["POST"]),
+                respect_retry_after_header=True,
+                raise_on_status=False,
+            ),
+        )
+
+    def post(self, url: str, payload: dict) -> requests.Response:
+        """
+        Sends a POST request to the Notion API, waiting for the rate limiter first.
+
+        Args:
+            url (str): The URL of the Notion API endpoint.
+            payload (dict): The JSON body of the request.
+
+        Returns:
+            requests.Response: The response of the Notion API.
+        """
+        self.limiter.acquire()
+        return self.session.post(url, data=orjson.dumps(payload), timeout=60)
+
     def check_house(self, house: House) -> bool:
         """
         Checks if a house is already present in the Notion database.
 
+        The query asks for a single row, since only the presence of the house matters.
+        add_houses does not use this method. Concurrent checks of the same house share a
+        single Notion query: the first caller sends it and the others wait for its result.
+
         Args:
             house (House): The house object to check in the Notion database.
 
         Returns:
             bool: True if the house is found in the Notion database, False otherwise.
         """
-        if NOTION_DATABASE_ID == "PUT_YOUR_NOTION_DATABASE_ID_HERE":
-            raise ValueError(
-                "Notion Database ID in .env file should be set. Now it contains an example value."
-            )
+        house_id = str(house.id)
+        if house_id in self.existing_ids:
+            return True
+
+        with self.inflight_lock:
+            future = self.inflight_checks.get(house_id)
+            is_owner = future is None
+            if is_owner:
+                future = Future()
+                self.inflight_checks[house_id] = future
+
+        if not is_owner:
+            return future.result()
 
-        query_url = f"https://api.notion.com/v1/databases/{NOTION_DATABASE_ID}/query"
         query_payload = {
-            "filter": {"property": "House ID", "title": {"equals": house.id}}
+            "filter": {"property": "House ID", "title": {"equals": house_id}},
+            "page_size": 1,
         }
 
-        response = requests.post(
-            query_url, headers=self.headers, json=query_payload, timeout=60
+        try:
+            response = self.post(NOTION_QUERY_URL, query_payload)
+            response.raise_for_status()
+
+            is_found = bool(orjson.loads(response.content)["results"])
+            if is_found:
+                self.existing_ids.add(house_id)
+            future.set_result(is_found)
+            return is_found
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.inflight_lock:
+                self.inflight_checks.pop(house_id, None)
+
+    def get_existing_ids(self) -> set:
+        """
+        Collects the IDs of all houses already present in the Notion database.
+
+        The database is read page by page (up to 100 entries per request), so checking
+        N houses costs ceil(total / 100) requests instead of N.
+
+        Returns:
+            set: House IDs (as strings) found in the Notion database.
+        """
+        return self.query_ids({"page_size": 100})
+
+    def query_ids(self, query_payload: dict) -> set:
+        """
+        Collects the house IDs of all Notion database entries matching a query.
+
+        Results are read page by page, following Notion's cursor until no more are left.
+
+        Args:
+            query_payload (dict): The body of the database query, including its page size.
+
+        Returns:
+            set: House IDs (as strings) of the matching entries.
+        """
+        existing_ids = set()
+
+        while True:
+            response = self.post(NOTION_QUERY_URL, query_payload)
+            response.raise_for_status()
+            response_data = orjson.loads(response.content)
+
+            existing_ids.update(
+                self.get_house_id(result) for result in response_data["results"]
+            )
+
+            if not response_data["has_more"]:
+                return existing_ids
+            query_payload["start_cursor"] = response_data["next_cursor"]
+
+    def check_houses(self, houses: list) -> set:
+        """
+        Checks which of the given houses are already present in the Notion database.
+
+        Houses are checked in chunks of NOTION_FILTER_CHUNK_SIZE, one query per chunk with
+        an "or" filter on their IDs. All result pages are read, since a house ID can have
+        more than one entry in the database.
+
+        Args:
+            houses (list): The house objects to check in the Notion database.
+
+        Returns:
+            set: IDs (as strings) of the given houses found in the Notion database.
+        """
+        existing_ids = set()
+
+        for chunk_start in range(0, len(houses), NOTION_FILTER_CHUNK_SIZE):
+            chunk = houses[chunk_start : chunk_start + NOTION_FILTER_CHUNK_SIZE]
+            query_payload = {
+                "filter": {
+                    "or": [
+                        {"property": "House ID", "title": {"equals": str(house.id)}}
+                        for house in chunk
+                    ]
+                },
+                "page_size": 100,
+            }
+
+            existing_ids.update(self.query_ids(query_payload))
+
+        return existing_ids
+
+    @staticmethod
+    def get_house_id(result: dict) -> str:
+        """
+        Extracts the house ID from a Notion database entry.
+
+        Args:
+            result (dict): A database entry returned by a Notion query.
+
+        Returns:
+            str: The house ID of the entry.
+        """
+        return "".join(
+            title["plain_text"] for title in result["properties"]["House ID"]["title"]
         )
 
-        response.raise_for_status()
-        return bool(response.json()["results"])
+    def create_page(self, house: House) -> bool:
+        """
+        Creates a Notion database entry for a house.
+
+        Rate limits and transient server errors are retried by the session, so only terminal
+        failures are reported here.
+
+        Args:
+            house (House): The house object to add to the Notion database.
+
+        Returns:
+            bool: True if the entry was created, False otherwise.
+        """
+        create_payload = {
+            "parent": NOTION_PAGE_PARENT,
+            "properties": house.notion_properties,
+        }
+
+        try:
+            response = self.post(NOTION_PAGES_URL, create_payload)
+            response.raise_for_status()
+        except requests.exceptions.HTTPError as e:
+            try:
+                error = orjson.loads(e.response.content)
+            except orjson.JSONDecodeError:
+                error = {"code": e.response.status_code, "message": e.response.text}
+            logger.error(
+                "Error creating entry for House ID %s (%s): %s",
+                house.id,
+                error.get("code"),
+                error.get("message"),
+            )
+            return False
+        except requests.exceptions.RequestException as e:
+            logger.error("Error creating entry for House ID %s: %s", house.id, e)
+            return False
+
+        logger.info("New house with ID %s added to the database.", house.id)
+        return True
 
     def add_houses(self, found_houses: list) -> None:
         """
         Adds a list of found houses from Funda to the Notion database.
 
+        Houses found more than once are uploaded once, keeping the first one found. Houses
+        with IDs already known locally are skipped without any request. The remaining houses
+        are checked with filtered queries, or, if there are more than
+        NOTION_FILTER_SCAN_THRESHOLD of them, by fetching all IDs from Notion once per service
+        instance. Entries for new houses are created concurrently, sharing the session's
+        connection pool.
+
         Args:
             found_houses (list): List of found houses from Funda.
         """
+        unique_houses = {}
         for house in found_houses:
-            if self.check_house(house):
-                print(f"House ID {house.id} already exists in the database.")
-                continue
-
-            create_url = "https://api.notion.com/v1/pages"
-
-            create_payload = {
-                "parent": {"database_id": NOTION_DATABASE_ID},
-                "properties": {
-                    "House ID": {"title": [{"text": {"content": str(house.id)}}]},
-                    "URL": {"url": house.url},
-                    "Post Address": {
-                        "rich_text": [{"text": {"content": house.address.full}}]
-                    },
-                    "City": {"rich_text": [{"text": {"content": house.address.city}}]},
-                    "Price": {"number": house.price},
-                    "ZIP Code": {
-                        "rich_text": [{"text": {"content": house.address.zip_code}}]
-                    },
-                    "Time to office S.": {
-                        "rich_text": [{"text": {"content": house.s_office_travel_time}}]
-                    },
-                    "Time to office V.": {
-                        "rich_text": [{"text": {"content": house.v_office_travel_time}}]
-                    },
-                    "Life Level Score": {"number": house.life_level_score},
-                },
+            unique_houses.setdefault(str(house.id), house)
+        if len(unique_houses) < len(found_houses):
+            logger.info(
+                "Skipped %d duplicate houses found more than once.",
+                len(found_houses) - len(unique_houses),
+            )
+        found_houses = list(unique_houses.values())
+
+        unknown_houses = [
+            house for house in found_houses if str(house.id) not in self.existing_ids
+        ]
+
+        if unknown_houses and not self.existing_ids_fetched:
+            if len(unknown_houses) > NOTION_FILTER_SCAN_THRESHOLD:
+                self.existing_ids.update(self.get_existing_ids())
+                self.existing_ids_fetched = True
+            else:
+                self.existing_ids.update(self.check_houses(unknown_houses))
+
+        new_houses = []
+
+        for house in found_houses:
+            if str(house.id) in self.existing_ids:
+                logger.info("House ID %s already exists in the database.", house.id)
+            else:
+                new_houses.append(house)
+
+        with ThreadPoolExecutor(max_workers=NOTION_MAX_WORKERS) as executor:
+            futures = {
+                executor.submit(self.create_page, house): house for house in new_houses
             }
 
-            response = requests.post(
-                create_url, headers=self.headers, json=create_payload, timeout=60
+            for future in as_completed(futures):
+                if future.result():
+                    self.existing_ids.add(str(futures[future].id))
+
+        self.save_existing_ids()
+
+    @staticmethod
+    def load_existing_ids() -> set:
+        """
+        Loads known house IDs from 'notion_ids.json' in the data directory.
+
+        IDs saved for a different Notion database are ignored. An unreadable file is
+        ignored as well, so the IDs are looked up in Notion again.
+
+        Returns:
+            set: House IDs (as strings) known to be present in the Notion database.
+        """
+        if not os.path.exists(NOTION_IDS_CACHE_PATH):
+            return set()
+
+        try:
+            with open(NOTION_IDS_CACHE_PATH, encoding="utf-8") as cache_file:
+                saved_ids = json.load(cache_file)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable %s: %s", NOTION_IDS_CACHE_PATH, e)
+            return set()
+
+        if saved_ids.get("database_id") != NOTION_DATABASE_ID:
+            return set()
+        return set(saved_ids.get("house_ids", []))
+
+    def save_existing_ids(self) -> None:
+        """
+        Writes known house IDs to 'notion_ids.json' in the data directory.
+        """
+        tmp_path = f"{NOTION_IDS_CACHE_PATH}.tmp"
+
+        with open(tmp_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {
+                    "database_id": NOTION_DATABASE_ID,
+                    "house_ids": sorted(self.existing_ids),
+                },
+                cache_file,
             )
 
-            try:
-                response.raise_for_status()
-                print(f"New house with ID {house.id} added to the database.")
-            except requests.exceptions.HTTPError as e:
-                print(
-                    f"Error creating entry for House ID {house.id}: {e.response.text}"
-                )
+        os.replace(tmp_path, NOTION_IDS_CACHE_PATH)
@@ -0,0 +1,67 @@
+"""
+Module for limiting the rate of requests sent to external APIs from several threads.
+
+Dependencies:
+    time
+    threading
+
+Classes:
+    RateLimiter: A thread-safe token bucket limiting the rate of requests.
+
+Methods in RateLimiter:
+    acquire() -> None: Blocks until a request may be sent.
+"""
+
+import time
+import threading
+
+
+class RateLimiter:
+    """
+    A thread-safe token bucket limiting the rate of requests.
+
+    Attributes:
+        rate (float): Number of tokens added per second.
+        burst (int): Maximum number of tokens in the bucket.
+        tokens (float): Number of tokens currently in the bucket.
+        last_refill (float): Monotonic time of the last refill.
+        lock (threading.Lock): Lock guarding the bucket state.
+
+    Methods:
+        acquire() -> None:
+            Blocks until a token is available and takes it.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        """
+        Initializes the RateLimiter with a full bucket.
+
+        Args:
+            rate (float): Number of tokens added per second.
+            burst (int): Maximum number of tokens in the bucket.
+        """
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """
+        Blocks until a token is available and takes it.
+        """
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.burst, self.tokens + (now - self.last_refill) * self.rate
+                )
+                self.last_refill = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                wait_time = (1 - self.tokens) / self.rate
+
+            time.sleep(wait_time)